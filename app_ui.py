@@ -60,7 +60,7 @@ final_report = """
                 - As `lojas 3 e 2` são as que possuem maior avaliação média.
                 - A `loja 1` tem a menor avaliação média.<br><br>
             3. **Frete Médio:**
-                - A `loja 4` possui o menor frete médio, com uma diferença significativa, seguida da `loja 3`.<br><br>
+                - A `loja 4` possui o menor frete médio, seguida da `loja 3`.<br><br>
             4. **Vendas por Categoria:**<br>
                 As categorias de `móveis`, `eletrônicos` e `brinquedos` são as que possuem maior número de vendas. Nestas categorias:
                 - As `lojas 3 e 4` têm o melhor desempenho.
@@ -72,13 +72,26 @@ final_report = """
             6. **Distribuição Geográfica:**
                 - Das 9421 vendas registradas, 6257 `(66,41%)` foram realizadas no raio de `latitude -20` e `longitude -46`, que corresponde à região central de São Paulo.<br><br>
             
-            💡 **Insights significativos:**<br>
+            💡 **Insights relevantes:**<br>
             As lojas possuem estatísticas muito similares que dificultam a aferição da pior performance dentre elas. Observa-se que:
             - A `loja 1` possui o melhor desempenho entre os produtos mais vendidos e o maior faturamento.
             - A `loja 3` e a `loja 4` possuem excelente desempenho de vendas entre as categorias e produtos mais vendidos enquanto ao mesmo tempo possuem o menor frete médio, evidência de que os sistemas de distribuição destas lojas atendem com melhor eficiência a região central de São Paulo, onde se registra a maior quantidade de vendas.
             - A `loja 2` possui o pior desempenho em vendas, embora tenha o segundo maior faturamento. Além disso, possui o segundo maior frete médio. O alto faturamento é provavelmente decorrente de um maior valor agregado dos produtos vendidos, o que não se traduz necessariamente em lucros.<br><br>
+            """
 
+# Store recommended for sale in the final conclusion
+recommended_loja = 'Loja 2'
+
+final_conclusion = """
             ### 📊 Conclusão das Observações
             ➡️ Considerando os dados avaliados anteriormente:
             - Embora nenhuma das lojas apresente um desempenho consideravelmente ruim, dentre todas as observadas a `loja 2` se destaca como a melhor candidata a ser vendida.
-            """
\ No newline at end of file
+            """
+
+bootstrap_report = """
+            ### 🎲 Significância Estatística
+            ➡️ As estatísticas globais são estimativas pontuais. Para verificar se as diferenças entre as lojas são reais, foram calculados **intervalos de confiança de 95%** por *bootstrap* (reamostragem das vendas de cada loja).
+            Os p-valores das comparações entre lojas são ajustados pelo método de *Holm*, pois todas as comparações são testadas em conjunto.<br><br>
+
+            Comparações com diferença significativa:
+            """
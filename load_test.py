@@ -0,0 +1,277 @@
+import sys
+import os
+import argparse
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from streamlit.runtime.caching.cache_utils import CachedFunc
+from streamlit.testing.v1 import AppTest
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# # #
+# Load test harness for the Streamlit app
+# # #
+#
+# Drives N simulated sessions against `main.py` headlessly through Streamlit's AppTest.
+# Every session runs in its own thread, like the sessions of a real Streamlit server,
+# sharing the same process-wide `st.cache_data` caches.
+#
+# Usage (from the project root):
+#   python load_test.py --sessions 8 --interactions 20
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(PROJECT_DIR, "main.py")
+STORES = ["Loja 1", "Loja 2", "Loja 3", "Loja 4"]
+
+
+class CacheStats:
+    '''
+    Counts the lookups and hits of every `st.cache_data` site while the load test runs.
+
+    Streamlit has no public hook for cache hits, so `CachedFunc` is patched:
+    every `_get_or_create_cached_value` call is a lookup and every `_handle_cache_hit`
+    call is a hit (including the ones resolved after waiting on another session's compute lock).
+    '''
+    def __init__(self):
+        self.lookups = defaultdict(int)
+        self.hits = defaultdict(int)
+        self._lock = threading.Lock()
+        self._originals = {}
+
+    def install(self):
+        original_lookup = CachedFunc._get_or_create_cached_value
+        original_hit = CachedFunc._handle_cache_hit
+        stats = self
+
+        def counted_lookup(cached_func, *args, **kwargs):
+            with stats._lock:
+                stats.lookups[cached_func._info.func.__qualname__] += 1
+            return original_lookup(cached_func, *args, **kwargs)
+
+        def counted_hit(cached_func, *args, **kwargs):
+            with stats._lock:
+                stats.hits[cached_func._info.func.__qualname__] += 1
+            return original_hit(cached_func, *args, **kwargs)
+
+        self._originals = {
+            '_get_or_create_cached_value': original_lookup,
+            '_handle_cache_hit': original_hit,
+        }
+        CachedFunc._get_or_create_cached_value = counted_lookup
+        CachedFunc._handle_cache_hit = counted_hit
+
+    def uninstall(self):
+        for name, method in self._originals.items():
+            setattr(CachedFunc, name, method)
+        self._originals = {}
+
+
+def peak_rss_mb() -> float | None:
+    '''
+    Returns the peak resident set size of the process in MB, or None if unavailable.
+    '''
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    if sys.platform == "darwin":
+        return peak / 1024 ** 2
+
+    return peak / 1024
+
+
+def run_session(session_id: int, interactions: int, download_ratio: float, seed: int, timeout: float) -> dict:
+    '''
+    Simulates a single user session: an initial page load followed by random interactions.
+    ### Parameters:
+    - session_id: Identifier of the session, used to derive its random seed.
+    - interactions: Number of interactions after the initial page load.
+    - download_ratio: Probability of an interaction being a download click instead of a filter change.
+    - seed: Base random seed of the load test.
+    - timeout: Maximum time in seconds for a single rerun.
+
+    ### Returns:
+    - A dictionary with the latencies (in seconds) of the successful reruns,
+    the number of failed reruns and the exceptions that made them fail.
+    '''
+    rng = random.Random(seed + session_id)
+    app = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    latencies = []
+    failed_reruns = 0
+    failures = []
+
+    def rerun(action):
+        nonlocal failed_reruns
+        start = time.perf_counter()
+        try:
+            action()
+        except Exception as error:
+            # The rerun itself failed (e.g. it timed out)
+            failed_reruns += 1
+            failures.append({'type': type(error).__name__, 'message': str(error), 'location': 'load_test.py'})
+            return
+        latency = time.perf_counter() - start
+        if not app.exception:
+            latencies.append(latency)
+            return
+        failed_reruns += 1
+        # Exceptions raised by the app script are rendered as elements, as in the browser
+        for exception in app.exception:
+            frames = [line.strip().splitlines()[0] for line in exception.stack_trace if line.strip().startswith('File ')]
+            # Report the innermost frame of the project (app, modules or utils), where the failure can be fixed
+            app_frames = [frame for frame in frames if f'"{PROJECT_DIR}{os.sep}' in frame] or frames
+            failures.append({
+                'type': exception.proto.type,
+                'message': exception.proto.message,
+                'location': app_frames[-1] if app_frames else 'unknown',
+            })
+
+    # Initial page load
+    rerun(app.run)
+
+    for _ in range(interactions):
+        # A failed rerun may stop before the widgets are rendered
+        if not app.sidebar.multiselect:
+            break
+        if rng.random() < download_ratio and app.get('download_button'):
+            rerun(app.get('download_button')[0].click().run)
+        else:
+            # Users can also clear the selection
+            selected_lojas = sorted(rng.sample(STORES, rng.randint(0, len(STORES))))
+            rerun(app.sidebar.multiselect[0].set_value(selected_lojas).run)
+
+    return {'latencies': latencies, 'failed_reruns': failed_reruns, 'failures': failures}
+
+
+def run_load_test(sessions: int, interactions: int, download_ratio: float = 0.2, seed: int = 0, timeout: float = 60) -> dict:
+    """
+    🏋️ **Function Description:**
+    Runs `sessions` simulated users concurrently against `main.py` and gathers performance metrics.
+
+    📥 **Parameters:**
+    - `sessions` : `int`
+    Number of concurrent simulated sessions.
+
+    - `interactions` : `int`
+    Number of random interactions (filter changes or download clicks) per session.
+
+    - `download_ratio` : `float`
+    Probability of an interaction being a download click.
+
+    - `seed` : `int`
+    Random seed, so that runs are reproducible.
+
+    - `timeout` : `float`
+    Maximum time in seconds for a single rerun.
+
+    📤 **Returns:**
+    - `report` : `dict`
+    A dictionary with the following metrics:
+
+    - 🔁 **'reruns'** / **'failed_reruns'** (`int`):
+        Number of successful and failed reruns.
+
+    - ⏱️ **'latency'** (`dict`):
+        p50, p95 and p99 latency of the successful reruns in milliseconds.
+
+    - 🚀 **'throughput'** (`float`):
+        Successful reruns per second over the whole test.
+
+    - 🧠 **'peak_rss_mb'** (`float`):
+        Peak resident memory of the process (None if unavailable).
+
+    - 🗃️ **'cache'** (`dict`):
+        Lookups, hits and hit rate for each `st.cache_data` site.
+
+    - 💥 **'failures'** (`list`):
+        Exceptions of the failed reruns grouped by type, message and location, with their count (most frequent first).
+    """
+    cache_stats = CacheStats()
+    cache_stats.install()
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=sessions) as executor:
+            results = list(executor.map(
+                lambda session_id: run_session(session_id, interactions, download_ratio, seed, timeout),
+                range(sessions),
+            ))
+        elapsed = time.perf_counter() - start
+    finally:
+        cache_stats.uninstall()
+
+    latencies = np.array([latency for result in results for latency in result['latencies']])
+    percentiles = np.percentile(latencies, [50, 95, 99]) * 1000 if latencies.size else [np.nan] * 3
+    failures = Counter(
+        (failure['type'], failure['message'], failure['location'])
+        for result in results for failure in result['failures']
+    )
+
+    report = {
+        'sessions': sessions,
+        'reruns': int(latencies.size),
+        'failed_reruns': sum(result['failed_reruns'] for result in results),
+        'elapsed': elapsed,
+        'latency': dict(zip(['p50', 'p95', 'p99'], percentiles)),
+        'throughput': latencies.size / elapsed,
+        'peak_rss_mb': peak_rss_mb(),
+        'cache': {
+            name: {
+                'lookups': lookups,
+                'hits': cache_stats.hits[name],
+                'hit_rate': cache_stats.hits[name] / lookups,
+            }
+            for name, lookups in sorted(cache_stats.lookups.items())
+        },
+        'failures': [
+            {'type': error_type, 'message': message, 'location': location, 'count': count}
+            for (error_type, message, location), count in failures.most_common()
+        ],
+    }
+
+    return report
+
+
+def print_report(report: dict):
+    '''
+    Prints a load test report in a human readable format.
+    ### Parameters:
+    - report: The dictionary returned by `run_load_test()`.
+    '''
+    latency = report['latency']
+    peak_rss = report['peak_rss_mb']
+
+    print(f"Sessions:     {report['sessions']}")
+    print(f"Reruns:       {report['reruns']} succeeded, {report['failed_reruns']} failed in {report['elapsed']:.2f}s")
+    print(f"Latency (ms): p50={latency['p50']:.1f}  p95={latency['p95']:.1f}  p99={latency['p99']:.1f}")
+    print(f"Throughput:   {report['throughput']:.2f} successful reruns/s")
+    print(f"Peak RSS:     {f'{peak_rss:.1f} MB' if peak_rss is not None else 'n/a'}")
+    print("Cache hit rates (st.cache_data):")
+    for name, stats in report['cache'].items():
+        print(f"  {name:<40} {stats['hits']:>6}/{stats['lookups']:<6} {stats['hit_rate']:>7.1%}")
+    if report['failures']:
+        print("Exceptions of the failed reruns:")
+        for failure in report['failures']:
+            print(f"  {failure['count']:>4}x {failure['type']}: {failure['message']}")
+            print(f"        at {failure['location']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the Alura Store dashboard with concurrent simulated sessions.")
+    parser.add_argument("--sessions", type=int, default=8, help="number of concurrent sessions")
+    parser.add_argument("--interactions", type=int, default=20, help="random interactions per session")
+    parser.add_argument("--download-ratio", type=float, default=0.2, help="probability of an interaction being a download click")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--timeout", type=float, default=60, help="maximum seconds per rerun")
+    args = parser.parse_args()
+
+    # The app reads some files relative to the working directory, as with `streamlit run main.py`
+    os.chdir(os.path.dirname(APP_PATH))
+    print_report(run_load_test(args.sessions, args.interactions, args.download_ratio, args.seed, args.timeout))
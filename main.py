@@ -9,9 +9,11 @@ import seaborn as sns
 from modules.loader import load_data
 from modules.analyze_stores import analyze_data
 from modules.build_statistics import build_global_statistics, get_top10_products_and_shipping_mean
+from modules.bootstrap_comparisons import build_bootstrap_comparisons
 from utils.plot_horizontal_bar import plot_horizontal_bar
 from utils.generate_downloadable_zip import zip_files
-from app_ui import streamlit_header, sidebar_credits, final_report
+from utils.format_number import format_number
+from app_ui import streamlit_header, sidebar_credits, final_report, bootstrap_report, final_conclusion, recommended_loja
 
 # # #
 # Main code
@@ -39,12 +41,17 @@ lojas_data = {f'loja{i+1}': data for i, data in enumerate(lojas_analyzed)}
 lojas_comparisons = build_global_statistics(lojas_data)
 lojas_comparisons = get_top10_products_and_shipping_mean(lojas_comparisons, lojas_pre_processed[0], lojas_pre_processed[1], lojas_pre_processed[2], lojas_pre_processed[3])
 
+# Generating confidence intervals and significance tests
+lojas_comparisons.update(build_bootstrap_comparisons({f'Loja {i+1}': loja for i, loja in enumerate(lojas_pre_processed)}))
+
 # Unpacking the data
 lojas_stats = lojas_comparisons['lojas_stats']
 lojas_categories = lojas_comparisons['lojas_categories_ranking']
 lojas_products = lojas_comparisons['lojas_products_ranking']
 lojas_top10_products_shipping_mean = lojas_comparisons['top10_products_shipping_mean']
 lojas_sales_distribution = lojas_comparisons['lojas_sales_distribution']
+lojas_stats_ci = lojas_comparisons['lojas_stats_ci']
+lojas_pairwise_tests = lojas_comparisons['lojas_pairwise_tests']
 
 # Setup Streamlit layout
 # 
@@ -194,6 +201,12 @@ with st.expander('Ver Dados Brutos', expanded=False):
     st.subheader("Distribuição Geográfica de Vendas")
     st.dataframe(lojas_sales_distribution, use_container_width=True)
 
+    st.subheader("Intervalos de Confiança (95%)")
+    st.dataframe(lojas_stats_ci.T, use_container_width=True)
+
+    st.subheader("Comparações entre Lojas")
+    st.dataframe(lojas_pairwise_tests, use_container_width=True)
+
 # Download data section
 # 
 st.markdown("""<a name="download-data"></a><h1 style="font-size: 2rem; letter-spacing: 0.04rem; margin-bottom: 0.5rem">⬇️ Download dos Dados</h1>""", unsafe_allow_html=True)
@@ -209,4 +222,31 @@ st.download_button(
 # Final report section
 # 
 st.markdown("""<a name="final-report"></a><h1 style="font-size: 2rem; letter-spacing: 0.04rem; margin-bottom: 0.5rem">📝 Relatório Final</h1>""", unsafe_allow_html=True)
-st.markdown(final_report, unsafe_allow_html=True)
\ No newline at end of file
+st.markdown(final_report, unsafe_allow_html=True)
+st.markdown(bootstrap_report, unsafe_allow_html=True)
+significant_tests = lojas_pairwise_tests[lojas_pairwise_tests['Significativo']]
+significant_findings = {
+    (metric, loja_a, loja_b):
+        f"- `{metric}` é maior na `{(loja_a if difference > 0 else loja_b).lower()}` do que na `{(loja_b if difference > 0 else loja_a).lower()}` "
+        f"(diferença de {format_number(abs(difference))}, p-valor ajustado de {format_number(p_value, 4)})"
+    for (metric, loja_a, loja_b), difference, p_value in zip(
+        significant_tests.index, significant_tests['Diferença (A - B)'], significant_tests['p-valor ajustado (Holm)']
+    )
+}
+if significant_findings:
+    st.markdown("\n".join(significant_findings.values()))
+    st.dataframe(significant_tests, use_container_width=True)
+else:
+    st.markdown("- Nenhuma diferença entre as lojas é estatisticamente significativa.")
+
+# The recommendation is checked against the significance tests
+st.markdown(final_conclusion, unsafe_allow_html=True)
+recommended_findings = [text for (_, loja_a, loja_b), text in significant_findings.items() if recommended_loja in (loja_a, loja_b)]
+if recommended_findings:
+    st.markdown(f"- Diferenças estatisticamente significativas envolvendo a `{recommended_loja.lower()}`:\n" + "\n".join(f"    {text}" for text in recommended_findings))
+else:
+    st.markdown(
+        f"- Nenhuma diferença entre a `{recommended_loja.lower()}` e as demais lojas é estatisticamente significativa: "
+        "a recomendação se apoia nas estimativas pontuais e no desempenho de vendas por categoria e produto, "
+        "e deve ser confirmada com outros indicadores (ex.: lucro e custos operacionais)."
+    )
@@ -0,0 +1,270 @@
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Columns resampled together, in the same order as the metrics of `lojas_stats`
+BOOTSTRAP_COLUMNS = ['Preço', 'Avaliação da compra', 'Frete']
+BOOTSTRAP_METRICS = ['Faturamento', 'Média Avaliações', 'Frete Médio']
+
+# Number of resamples of each pool task. Every chunk has its own seed, so the results
+# depend neither on the number of workers nor on which worker computes each chunk
+CHUNK_RESAMPLES = 250
+
+# Maximum number of resample counts drawn at once by each worker.
+# Peak memory is about 2 × MAX_BATCH_ELEMENTS × 8 B = 128 MB per worker (drawn indices and counts, then counts and their float copy)
+MAX_BATCH_ELEMENTS = 2 ** 23
+
+# Below this total number of sales, sending the work to the process pool costs more than it saves
+PARALLEL_MIN_SALES = 200_000
+
+# Process pool reused across cache misses, as spawning the workers takes seconds
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+def get_pool(n_workers: int) -> ProcessPoolExecutor:
+    '''
+    Returns the shared process pool, creating it on first use or when the number of workers changes.
+    ### Parameters:
+    - n_workers: Number of worker processes.
+
+    ### Returns:
+    - The process pool.
+    '''
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != n_workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # Spawned workers, as forking the threaded Streamlit server is unsafe
+            _pool = ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context('spawn'))
+            _pool_workers = n_workers
+
+        return _pool
+
+def compute_metrics(totals: np.ndarray) -> np.ndarray:
+    '''
+    Computes the store metrics from the column sums and the number of valid (non-NaN) values of each column,
+    with the same semantics as pandas `sum()` and `mean()`, which skip NaNs.
+    ### Parameters:
+    - totals: Array of shape (..., 6): the sums of the `BOOTSTRAP_COLUMNS`, followed by their number of valid values.
+
+    ### Returns:
+    - Array of shape (..., 3) with the revenue, rating mean and shipping mean.
+    '''
+    sums, valid_counts = totals[..., :3], totals[..., 3:]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Revenue is a sum, ratings and shipping are means
+        return np.concatenate([sums[..., :1], sums[..., 1:] / valid_counts[..., 1:]], axis=-1)
+
+def bootstrap_resamples(values: np.ndarray, n_resamples: int, seed: np.random.SeedSequence) -> np.ndarray:
+    '''
+    Computes the bootstrap replicates of the store metrics in matrix form.
+
+    Each resample is a row of counts (how many times each sale is picked), built with a single `np.bincount`
+    over a whole batch of drawn indices, so the batch is reduced with one matrix product instead of a Python loop.
+    ### Parameters:
+    - values: Array of shape (n_sales, 3) with the `BOOTSTRAP_COLUMNS` of a store (NaNs are skipped).
+    - n_resamples: Number of bootstrap resamples to draw.
+    - seed: Seed sequence of the resamples.
+
+    ### Returns:
+    - Array of shape (n_resamples, 3) with the revenue, rating mean and shipping mean of each resample.
+    '''
+    n_sales = values.shape[0]
+    if n_sales == 0:
+        raise ValueError("Cannot bootstrap a store without sales.")
+
+    rng = np.random.default_rng(seed)
+    batch_size = max(1, MAX_BATCH_ELEMENTS // n_sales)
+    valid = ~np.isnan(values)
+    weights = np.hstack([np.where(valid, values, 0), valid])
+
+    totals = np.empty((n_resamples, weights.shape[1]))
+    for start in range(0, n_resamples, batch_size):
+        stop = min(start + batch_size, n_resamples)
+        indices = rng.integers(0, n_sales, size=(stop - start, n_sales))
+        # Offset every row, so that one bincount gives the counts of the whole batch
+        indices += np.arange(stop - start)[:, None] * n_sales
+        counts = np.bincount(indices.ravel(), minlength=indices.size).reshape(indices.shape)
+        del indices
+        totals[start:stop] = counts.astype(float) @ weights
+
+    return compute_metrics(totals)
+
+def bootstrap_shared_resamples(shm_name: str, shape: tuple, n_resamples: int, seed: np.random.SeedSequence) -> np.ndarray:
+    '''
+    Pool task: runs `bootstrap_resamples()` on a store's values held in shared memory,
+    so that the data is not pickled to the workers along with every chunk.
+    ### Parameters:
+    - shm_name: Name of the shared memory block with the store's values.
+    - shape: Shape of the store's values.
+    - n_resamples: Number of bootstrap resamples to draw.
+    - seed: Seed sequence of the chunk.
+
+    ### Returns:
+    - The replicates returned by `bootstrap_resamples()`.
+    '''
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        replicates = bootstrap_resamples(np.ndarray(shape, dtype=float, buffer=shm.buf), n_resamples, seed)
+    finally:
+        shm.close()
+
+    return replicates
+
+@st.cache_data
+def build_bootstrap_comparisons(
+        lojas: dict,
+        n_resamples: int = 2000,
+        confidence: float = 0.95,
+        seed: int = 42,
+        n_workers: int | None = None,
+) -> dict:
+    """
+    🎲 **Function Description:**
+    Builds **bootstrap confidence intervals** and **pairwise significance tests** for the store metrics
+    compared in `lojas_stats` (`'Faturamento'`, `'Média Avaliações'` and `'Frete Médio'`).
+
+    The resamples of every store are split into fixed-size chunks computed on a reused process pool,
+    unless the data is too small for the pool to pay off. NaNs are skipped, as in pandas.
+    Being cached with `st.cache_data`, the results are only recomputed when the data changes.
+
+    📥 **Parameters:**
+    - `lojas` : `dict`
+    A dictionary where each key is a store name (e.g. `'Loja 1'`) and each value is the pre-processed DataFrame of the store.
+
+    - `n_resamples` : `int`
+    Number of bootstrap resamples per store.
+
+    - `confidence` : `float`
+    Confidence level of the intervals (e.g. `0.95`).
+
+    - `seed` : `int`
+    Random seed, so that the results are reproducible.
+
+    - `n_workers` : `int`
+    Number of worker processes (defaults to the number of CPUs). With `1`, no process pool is used.
+    The results do not depend on it.
+
+    📤 **Returns:**
+    - `lojas_bootstrap` : `dict`
+    A dictionary containing the following DataFrames:
+
+    - 📏 **'lojas_stats_ci'** (`pd.DataFrame`):
+        Point estimate and confidence interval of each metric by store.
+
+    - ⚖️ **'lojas_pairwise_tests'** (`pd.DataFrame`):
+        Difference between each pair of stores for each metric, with its confidence interval,
+        two-sided bootstrap p-value, Holm adjusted p-value (over all comparisons)
+        and whether the difference is significant after the adjustment.
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    alpha = 1 - confidence
+    quantiles = [alpha / 2, 1 - alpha / 2]
+
+    lojas_values = {
+        loja_name: np.ascontiguousarray(loja[BOOTSTRAP_COLUMNS].to_numpy(dtype=float))
+        for loja_name, loja in lojas.items()
+    }
+    for loja_name, values in lojas_values.items():
+        if values.shape[0] == 0:
+            raise ValueError(f"Store '{loja_name}' has no sales to bootstrap.")
+
+    # Split the resamples of every store into fixed-size chunks, each with its own seed
+    chunk_sizes = [min(CHUNK_RESAMPLES, n_resamples - start) for start in range(0, n_resamples, CHUNK_RESAMPLES)]
+    store_seeds = np.random.SeedSequence(seed).spawn(len(lojas_values))
+    tasks = [
+        (loja_name, chunk_size, chunk_seed)
+        for loja_name, store_seed in zip(lojas_values, store_seeds)
+        for chunk_size, chunk_seed in zip(chunk_sizes, store_seed.spawn(len(chunk_sizes)))
+    ]
+    n_sales = sum(values.shape[0] for values in lojas_values.values())
+
+    # Compute the bootstrap replicates
+    if n_workers == 1 or n_sales < PARALLEL_MIN_SALES:
+        batches = [bootstrap_resamples(lojas_values[loja_name], chunk_size, chunk_seed) for loja_name, chunk_size, chunk_seed in tasks]
+    else:
+        # Each store's data is copied once into shared memory, which every chunk reads from
+        shared_blocks = {}
+        try:
+            for loja_name, values in lojas_values.items():
+                shared_blocks[loja_name] = shared_memory.SharedMemory(create=True, size=values.nbytes)
+                np.ndarray(values.shape, dtype=float, buffer=shared_blocks[loja_name].buf)[:] = values
+            pool = get_pool(n_workers)
+            futures = [
+                pool.submit(bootstrap_shared_resamples, shared_blocks[loja_name].name, lojas_values[loja_name].shape, chunk_size, chunk_seed)
+                for loja_name, chunk_size, chunk_seed in tasks
+            ]
+            batches = [future.result() for future in futures]
+        finally:
+            for shm in shared_blocks.values():
+                shm.close()
+                shm.unlink()
+
+    lojas_replicates = {loja_name: [] for loja_name in lojas_values}
+    for (loja_name, *_), batch in zip(tasks, batches):
+        lojas_replicates[loja_name].append(batch)
+    lojas_replicates = {loja_name: np.concatenate(batch_list) for loja_name, batch_list in lojas_replicates.items()}
+
+    # Confidence intervals by store
+    lojas_stats_ci = {}
+    for loja_name, values in lojas_values.items():
+        valid = ~np.isnan(values)
+        estimates = compute_metrics(np.concatenate([np.where(valid, values, 0).sum(axis=0), valid.sum(axis=0)]))
+        lower, upper = np.quantile(lojas_replicates[loja_name], quantiles, axis=0)
+        lojas_stats_ci[loja_name] = np.column_stack([estimates, lower, upper]).ravel()
+    lojas_stats_ci_df = pd.DataFrame.from_dict(
+        lojas_stats_ci,
+        orient='index',
+        columns=pd.MultiIndex.from_product([BOOTSTRAP_METRICS, ['Estimativa', 'IC Inferior', 'IC Superior']]),
+    )
+
+    # Pairwise differences between stores
+    lojas_pairwise_tests = []
+    for loja_a, loja_b in combinations(lojas_values, 2):
+        differences = lojas_replicates[loja_a] - lojas_replicates[loja_b]
+        lower, upper = np.quantile(differences, quantiles, axis=0)
+        # Two-sided p-value, with the (k + 1) / (B + 1) correction so that it is never exactly 0
+        tail_counts = np.minimum((differences <= 0).sum(axis=0), (differences >= 0).sum(axis=0))
+        p_values = np.minimum(1, 2 * (tail_counts + 1) / (n_resamples + 1))
+        # A metric without valid values in a store (e.g. only NaNs) cannot be compared
+        p_values[~np.isfinite(differences).all(axis=0)] = np.nan
+        for i, metric in enumerate(BOOTSTRAP_METRICS):
+            lojas_pairwise_tests.append({
+                'Métrica': metric,
+                'Loja A': loja_a,
+                'Loja B': loja_b,
+                'Diferença (A - B)': lojas_stats_ci_df.loc[loja_a, (metric, 'Estimativa')] - lojas_stats_ci_df.loc[loja_b, (metric, 'Estimativa')],
+                'IC Inferior': lower[i],
+                'IC Superior': upper[i],
+                'p-valor': p_values[i],
+            })
+    lojas_pairwise_tests_df = pd.DataFrame(lojas_pairwise_tests).set_index(['Métrica', 'Loja A', 'Loja B'])
+
+    # Holm adjustment over the comparisons that could be tested, as they are all tested together
+    p_values = lojas_pairwise_tests_df['p-valor'].to_numpy()
+    tested = np.flatnonzero(~np.isnan(p_values))
+    order = tested[np.argsort(p_values[tested])]
+    adjusted = np.full_like(p_values, np.nan)
+    adjusted[order] = np.minimum(1, np.maximum.accumulate((len(order) - np.arange(len(order))) * p_values[order]))
+    lojas_pairwise_tests_df['p-valor ajustado (Holm)'] = adjusted
+    lojas_pairwise_tests_df['Significativo'] = lojas_pairwise_tests_df['p-valor ajustado (Holm)'] < alpha
+    lojas_pairwise_tests_df = lojas_pairwise_tests_df.loc[BOOTSTRAP_METRICS]
+
+    # Format dataframes
+    lojas_stats_ci_df = lojas_stats_ci_df.round(2)
+    lojas_pairwise_tests_df = lojas_pairwise_tests_df.round({'Diferença (A - B)': 2, 'IC Inferior': 2, 'IC Superior': 2, 'p-valor': 4, 'p-valor ajustado (Holm)': 4})
+
+    lojas_bootstrap = {
+        'lojas_stats_ci': lojas_stats_ci_df,
+        'lojas_pairwise_tests': lojas_pairwise_tests_df,
+    }
+
+    return lojas_bootstrap
@@ -0,0 +1,10 @@
+def format_number(value: float, decimals: int = 2) -> str:
+    '''
+    Formats a number in the Brazilian format, used by the texts of the app.
+    ### Parameters:
+    - value: The number to format.
+    - decimals: Number of decimal places.
+    ### Returns:
+    - The formatted number (e.g. 150011.54 to '150.011,54').
+    '''
+    return f"{value:,.{decimals}f}".replace(',', '_').replace('.', ',').replace('_', '.')
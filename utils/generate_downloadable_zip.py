@@ -17,6 +17,8 @@ def zip_files(lojas_comparisons: dict) -> bytes:
     lojas_products = lojas_comparisons['lojas_products_ranking']
     lojas_top10_products_shipping_mean = lojas_comparisons['top10_products_shipping_mean']
     lojas_sales_distribution = lojas_comparisons['lojas_sales_distribution']
+    lojas_stats_ci = lojas_comparisons['lojas_stats_ci']
+    lojas_pairwise_tests = lojas_comparisons['lojas_pairwise_tests']
 
     def convert_df_to_csv(df):
         return df.to_csv(index=True).encode('utf-8')
@@ -39,6 +41,8 @@ def zip_files(lojas_comparisons: dict) -> bytes:
         zip_file.writestr("produtos_mais_vendidos.csv", convert_df_to_csv(lojas_products))
         zip_file.writestr("frete_medio_top10_produtos.csv", convert_df_to_csv(lojas_top10_products_shipping_mean))
         zip_file.writestr("distribuicao_geografica_vendas.csv", convert_df_to_csv(lojas_sales_distribution))
+        zip_file.writestr("intervalos_confianca.csv", convert_df_to_csv(lojas_stats_ci.T))
+        zip_file.writestr("comparacoes_entre_lojas.csv", convert_df_to_csv(lojas_pairwise_tests))
 
     # Move back to the start of the BytesIO buffer
     zip_buffer.seek(0)